@@ -1,181 +1,59 @@
 import streamlit as st
-import pandas as pd
+from streamlit.errors import StreamlitAPIException
 from database import BankingDatabase
 from banking_system import BankingSystem
+from ui import inject_css, render_card, render_transactions, show_success, show_error, show_info
 from datetime import datetime
 
-# Page config
-st.set_page_config(
-    page_title="Secure Banking System",
-    page_icon="🏦",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+# Page config (may only be set once per run)
+try:
+    st.set_page_config(
+        page_title="Secure Banking System",
+        page_icon="🏦",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+except StreamlitAPIException:
+    pass
 
 # Custom CSS
-st.markdown("""
-    <style>
-    /* App background: smooth diagonal gradient */
-    html, body, [data-testid="stAppViewContainer"] {
-        background: linear-gradient(135deg, #f7f9fc 0%, #eef5ff 50%, #f6fff4 100%) !important;
-    }
-
-    /* Sidebar: frosted look */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, rgba(255,255,255,0.85) 0%, rgba(255,255,255,0.65) 100%) !important;
-        backdrop-filter: blur(8px);
-        border-right: 1px solid rgba(255,255,255,0.35);
-    }
-
-    .main { padding: 2rem; }
-
-    /* Gradient header */
-    .header {
-        background: linear-gradient(90deg, #1f77b4, #28a745);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        font-size: 2.8rem;
-        font-weight: 800;
-        margin-bottom: 0.5rem;
-    }
-    .subheader {
-        color: #444;
-        font-size: 1.1rem;
-        font-style: italic;
-        margin-bottom: 2rem;
-    }
-
-    /* Card-style boxes with glassmorphism */
-    .card {
-        backdrop-filter: blur(6px);
-        background: rgba(255, 255, 255, 0.7) !important;
-        box-shadow: 0 10px 24px rgba(31, 119, 180, 0.08) !important;
-        padding: 1.25rem;
-        border-radius: 12px;
-        margin: 0.5rem 0 1rem 0;
-        transition: transform 0.2s ease;
-        text-align: center;
-        font-weight: 600;
-        border: 1px solid rgba(255,255,255,0.35) !important;
-    }
-    .card b { display:block; color:#222; margin-bottom: 0.35rem; }
-    .card:hover { transform: scale(1.02); }
-
-    /* Tabs: subtle frosted container */
-    .stTabs [data-baseweb="tab-list"] {
-        backdrop-filter: blur(8px);
-        background: rgba(255, 255, 255, 0.5);
-        border-radius: 12px;
-        border: 1px solid rgba(255,255,255,0.35);
-        padding: 4px 6px;
-        margin-bottom: 1rem;
-    }
-    .stTabs [data-baseweb="tab"] {
-        border-radius: 8px;
-        padding: 8px 12px;
-        margin: 0 4px;
-    }
-
-    /* Buttons */
-    div.stButton > button {
-        background: linear-gradient(90deg, #1f77b4, #28a745);
-        color: white;
-        border-radius: 8px;
-        font-weight: 700;
-        transition: 0.2s ease-in-out;
-        border: none;
-        padding: 0.6rem 0.85rem;
-        box-shadow: 0 8px 20px rgba(31, 119, 180, 0.25);
-    }
-    div.stButton > button:hover {
-        background: linear-gradient(90deg, #28a745, #1f77b4);
-        transform: translateY(-1px);
-        box-shadow: 0 12px 28px rgba(31, 119, 180, 0.3);
-    }
-
-    /* Animated alerts */
-    .success-box {
-        background: #d4edda;
-        padding: 1rem;
-        border-radius: 10px;
-        border-left: 6px solid #28a745;
-        animation: fadeIn 0.6s ease;
-        margin: 1rem 0;
-    }
-    .error-box {
-        background: #f8d7da;
-        padding: 1rem;
-        border-radius: 10px;
-        border-left: 6px solid #dc3545;
-        animation: shake 0.4s;
-        margin: 1rem 0;
-    }
-    .info-box {
-        background: #d1ecf1;
-        padding: 1rem;
-        border-radius: 10px;
-        border-left: 6px solid #17a2b8;
-        margin: 1rem 0;
-    }
-    @keyframes fadeIn {
-        from {opacity: 0; transform: translateY(4px);}
-        to {opacity: 1; transform: translateY(0);}
-    }
-    @keyframes shake {
-        0% { transform: translateX(0); }
-        25% { transform: translateX(-4px); }
-        50% { transform: translateX(4px); }
-        75% { transform: translateX(-4px); }
-        100% { transform: translateX(0); }
-    }
-
-    /* Badges for transaction types */
-    .badge {
-        display: inline-block;
-        padding: 0.2rem 0.5rem;
-        border-radius: 999px;
-        font-size: 0.8rem;
-        font-weight: 700;
-    }
-    .badge-deposit { background: #e6f4ea; color: #1e7e34; border: 1px solid #c7e9d1; }
-    .badge-withdrawal { background: #fbeaea; color: #a71d2a; border: 1px solid #f4c7cc; }
-    .badge-transfer-in { background: #e7f1fb; color: #0b5ed7; border: 1px solid #c6ddfb; }
-    .badge-transfer-out { background: #fff3cd; color: #8a6d3b; border: 1px solid #ffe8a1; }
-
-    /* Table styling */
-    table {
-        border-collapse: collapse;
-        width: 100%;
-        font-size: 0.95rem;
-    }
-    th, td {
-        padding: 0.6rem 0.8rem;
-        border-bottom: 1px solid #eee;
-        text-align: left;
-        vertical-align: top;
-    }
-    th {
-        background: #f7f9fc;
-        font-weight: 700;
-    }
-    </style>
-""", unsafe_allow_html=True)
+inject_css()
 
 
 # Initialize session state
-if 'logged_in' not in st.session_state:
-    st.session_state.logged_in = False
-    st.session_state.account_number = None
-    st.session_state.username = None
+for key, default in (('logged_in', False), ('account_number', None), ('username', None)):
+    st.session_state.setdefault(key, default)
 
-# Initialize database and banking system
-db = BankingDatabase()
-banking_system = BankingSystem()
+# Initialize database (shared across reruns and sessions)
+@st.cache_resource
+def get_db():
+    return BankingDatabase()
+
+db = get_db()
+
+# BankingSystem holds a session AES key, so each browser session gets its own
+if 'banking_system' not in st.session_state:
+    st.session_state.banking_system = BankingSystem()
+banking_system = st.session_state.banking_system
+
+# Transaction history rows shown per page
+TX_PAGE_SIZE = 10
+
+# Cached reads so unrelated widget interactions don't re-query the database.
+# One extra row is fetched to know whether a next history page exists.
+@st.cache_data(ttl=10)
+def _dashboard_snapshot(account_number, tx_limit=TX_PAGE_SIZE + 1):
+    return db.get_dashboard_snapshot(account_number, tx_limit)
+
+def _invalidate_account_cache(*account_numbers):
+    """Drop cached snapshots for accounts touched by a write"""
+    for account_number in account_numbers:
+        _dashboard_snapshot.clear(account_number)
 
 # ==================== AUTHENTICATION ====================
 def login_page():
     st.markdown('<h1 class="header">Secure Banking System</h1>', unsafe_allow_html=True)
-    st.markdown('<p class="subheader">Encrypted Banking with DES and RSA Cryptography</p>', unsafe_allow_html=True)
+    st.markdown('<p class="subheader">Encrypted Banking with AES and RSA Cryptography</p>', unsafe_allow_html=True)
 
     tab_login, tab_signup = st.tabs(["Login", "Sign Up"])
 
@@ -191,12 +69,12 @@ def login_page():
                     st.session_state.logged_in = True
                     st.session_state.account_number = account_number
                     st.session_state.username = username
-                    st.markdown('<div class="success-box">Login successful!</div>', unsafe_allow_html=True)
+                    show_success('Login successful!')
                     st.rerun()
                 else:
-                    st.markdown('<div class="error-box">Invalid username or password</div>', unsafe_allow_html=True)
+                    show_error('Invalid username or password')
             else:
-                st.markdown('<div class="info-box">Please enter both username and password</div>', unsafe_allow_html=True)
+                show_info('Please enter both username and password')
 
     with tab_signup:
         st.subheader("Create New Account")
@@ -211,34 +89,142 @@ def login_page():
                     new_username, new_password, full_name, initial_balance
                 )
                 if success:
-                    st.markdown(
-                        f'<div class="success-box"><strong>Account Created!</strong><br>Account Number: {account_number}</div>',
-                        unsafe_allow_html=True
-                    )
+                    show_success(f'<strong>Account Created!</strong><br>Account Number: {account_number}')
                     st.info("Please login with your credentials")
                 else:
-                    st.markdown(f'<div class="error-box">{message}</div>', unsafe_allow_html=True)
+                    show_error(message)
             else:
-                st.markdown('<div class="info-box">Please fill all fields</div>', unsafe_allow_html=True)
+                show_info('Please fill all fields')
 
 # ==================== MAIN DASHBOARD ====================
+def _flash_and_rerun(panel, message, note):
+    """Rerun the whole app so the summary cards pick up the new balance, keeping the success message"""
+    st.session_state[f'{panel}_flash'] = (message, note)
+    st.rerun()
+
+def _show_flash(panel):
+    """Show (once) the success message stashed by _flash_and_rerun"""
+    flash = st.session_state.pop(f'{panel}_flash', None)
+    if flash:
+        message, note = flash
+        show_success(message)
+        st.info(note)
+
+# Each tab is a fragment so widget interactions only rerun their own panel;
+# successful writes rerun the app so the Balance card matches the new balance
+@st.fragment
+def deposit_fragment():
+    st.subheader("Deposit Money")
+    deposit_amount = st.number_input("Amount to Deposit", min_value=1.0, step=100.0, key="deposit")
+    deposit_desc = st.text_input("Description (optional)", value="Deposit")
+
+    if st.button("Deposit", type="primary", use_container_width=True):
+        success, message, new_balance = db.deposit(
+            st.session_state.account_number,
+            deposit_amount,
+            deposit_desc
+        )
+        if success:
+            _invalidate_account_cache(st.session_state.account_number)
+            _flash_and_rerun('deposit', f'{message}<br>New Balance: ₹{new_balance:.2f}', "Transaction encrypted and stored securely")
+        else:
+            show_error(message)
+    _show_flash('deposit')
+
+@st.fragment
+def withdraw_fragment():
+    st.subheader("Withdraw Money")
+    withdraw_amount = st.number_input("Amount to Withdraw", min_value=1.0, step=100.0, key="withdraw")
+    withdraw_desc = st.text_input("Description (optional)", value="Withdrawal", key="withdraw_desc")
+
+    if st.button("Withdraw", type="primary", use_container_width=True):
+        success, message, new_balance = db.withdraw(
+            st.session_state.account_number,
+            withdraw_amount,
+            withdraw_desc
+        )
+        if success:
+            _invalidate_account_cache(st.session_state.account_number)
+            _flash_and_rerun('withdraw', f'{message}<br>New Balance: ₹{new_balance:.2f}', "Transaction encrypted and stored securely")
+        else:
+            show_error(message)
+    _show_flash('withdraw')
+
+@st.fragment
+def transfer_fragment():
+    st.subheader("Transfer Money")
+    to_account = st.text_input("Recipient Account Number")
+    transfer_amount = st.number_input("Amount to Transfer", min_value=1.0, step=100.0, key="transfer")
+
+    if st.button("Transfer", type="primary", use_container_width=True):
+        if to_account:
+            success, message, new_balance = db.transfer(
+                st.session_state.account_number,
+                to_account,
+                transfer_amount
+            )
+            if success:
+                _invalidate_account_cache(st.session_state.account_number, to_account)
+                _flash_and_rerun('transfer', f'{message}<br>New Balance: ₹{new_balance:.2f}', "Transfer encrypted and logged securely")
+            else:
+                show_error(message)
+        else:
+            show_info('Please enter recipient account number')
+    _show_flash('transfer')
+
+def _change_tx_page(step):
+    st.session_state.tx_page = max(0, st.session_state.tx_page + step)
+
+@st.fragment
+def history_fragment():
+    st.subheader("Transaction History")
+    # Refresh drops the cached snapshot so page 0 is re-read, then reruns only this fragment
+    st.button("Refresh", key="history_refresh", on_click=_invalidate_account_cache, args=(st.session_state.account_number,))
+
+    page = st.session_state.setdefault('tx_page', 0)
+    if page == 0:
+        # First page comes with the dashboard snapshot
+        _, transactions = _dashboard_snapshot(st.session_state.account_number)
+    else:
+        transactions = db.get_transaction_history(
+            st.session_state.account_number,
+            limit=TX_PAGE_SIZE + 1,
+            offset=page * TX_PAGE_SIZE
+        )
+    has_next = len(transactions) > TX_PAGE_SIZE
+    transactions = transactions[:TX_PAGE_SIZE]
+
+    if transactions:
+        render_transactions(transactions)
+    elif page == 0:
+        st.info("No transactions yet")
+
+    if page > 0 or has_next:
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            st.button("Previous", key="tx_prev", disabled=page == 0, on_click=_change_tx_page, args=(-1,), use_container_width=True)
+        with col_page:
+            st.markdown(f"Page {page + 1}")
+        with col_next:
+            st.button("Next", key="tx_next", disabled=not has_next, on_click=_change_tx_page, args=(1,), use_container_width=True)
+
 def dashboard():
     st.markdown(f'<h1 class="header">Dashboard - {st.session_state.username}</h1>', unsafe_allow_html=True)
 
-    account_info = db.get_account_info(st.session_state.account_number)
+    account_info, _ = _dashboard_snapshot(st.session_state.account_number)
 
     if account_info:
         # Summary cards
         col1, col2, col3, col4 = st.columns(4)
         with col1:
-            st.markdown(f"<div class='card'><b>Account Number</b>{st.session_state.account_number}</div>", unsafe_allow_html=True)
+            st.markdown(render_card("Account Number", st.session_state.account_number), unsafe_allow_html=True)
         with col2:
-            st.markdown(f"<div class='card'><b>Name</b>{account_info['full_name']}</div>", unsafe_allow_html=True)
+            st.markdown(render_card("Name", account_info['full_name']), unsafe_allow_html=True)
         with col3:
-            st.markdown(f"<div class='card'><b>Balance</b>₹{account_info['balance']:.2f}</div>", unsafe_allow_html=True)
+            st.markdown(render_card("Balance", f"₹{account_info['balance']:.2f}"), unsafe_allow_html=True)
         with col4:
             joined = account_info['created_at'][:10] if isinstance(account_info['created_at'], str) else str(account_info['created_at'])[:10]
-            st.markdown(f"<div class='card'><b>Member Since</b>{joined}</div>", unsafe_allow_html=True)
+            st.markdown(render_card("Member Since", joined), unsafe_allow_html=True)
 
         st.markdown("---")
 
@@ -246,136 +232,24 @@ def dashboard():
             "Deposit", "Withdraw", "Transfer", "Transaction History"
         ])
 
-        # Deposit tab
         with tab_deposit:
-            st.subheader("Deposit Money")
-            deposit_amount = st.number_input("Amount to Deposit", min_value=1.0, step=100.0, key="deposit")
-            deposit_desc = st.text_input("Description (optional)", value="Deposit")
-
-            if st.button("Deposit", type="primary", use_container_width=True):
-                success, message, new_balance = db.deposit(
-                    st.session_state.account_number,
-                    deposit_amount,
-                    deposit_desc
-                )
-                if success:
-                    st.markdown(
-                        f'<div class="success-box">{message}<br>New Balance: ₹{new_balance:.2f}</div>',
-                        unsafe_allow_html=True
-                    )
-                    st.info("Transaction encrypted and stored securely")
-                    st.rerun()
-                else:
-                    st.markdown(f'<div class="error-box">{message}</div>', unsafe_allow_html=True)
+            deposit_fragment()
 
-        # Withdraw tab
         with tab_withdraw:
-            st.subheader("Withdraw Money")
-            withdraw_amount = st.number_input("Amount to Withdraw", min_value=1.0, step=100.0, key="withdraw")
-            withdraw_desc = st.text_input("Description (optional)", value="Withdrawal", key="withdraw_desc")
-
-            if st.button("Withdraw", type="primary", use_container_width=True):
-                success, message, new_balance = db.withdraw(
-                    st.session_state.account_number,
-                    withdraw_amount,
-                    withdraw_desc
-                )
-                if success:
-                    st.markdown(
-                        f'<div class="success-box">{message}<br>New Balance: ₹{new_balance:.2f}</div>',
-                        unsafe_allow_html=True
-                    )
-                    st.info("Transaction encrypted and stored securely")
-                    st.rerun()
-                else:
-                    st.markdown(f'<div class="error-box">{message}</div>', unsafe_allow_html=True)
+            withdraw_fragment()
 
-        # Transfer tab
         with tab_transfer:
-            st.subheader("Transfer Money")
-            to_account = st.text_input("Recipient Account Number")
-            transfer_amount = st.number_input("Amount to Transfer", min_value=1.0, step=100.0, key="transfer")
-
-            if st.button("Transfer", type="primary", use_container_width=True):
-                if to_account:
-                    success, message = db.transfer(
-                        st.session_state.account_number,
-                        to_account,
-                        transfer_amount
-                    )
-                    if success:
-                        updated_info = db.get_account_info(st.session_state.account_number)
-                        new_balance = updated_info['balance'] if updated_info else 0
-                        st.markdown(
-                            f'<div class="success-box">{message}<br>New Balance: ₹{new_balance:.2f}</div>',
-                            unsafe_allow_html=True
-                        )
-                        st.info("Transfer encrypted and logged securely")
-                        st.rerun()
-                    else:
-                        st.markdown(f'<div class="error-box">{message}</div>', unsafe_allow_html=True)
-                else:
-                    st.markdown('<div class="info-box">Please enter recipient account number</div>', unsafe_allow_html=True)
+            transfer_fragment()
 
-        # Transaction history tab
         with tab_history:
-            st.subheader("Transaction History")
-            transactions = db.get_transaction_history(st.session_state.account_number, limit=50)
-
-            if transactions:
-                df = pd.DataFrame(transactions)
-
-                # Build type badges using your schema
-                def type_badge(t):
-                    t_upper = str(t).upper()
-                    if t_upper == "DEPOSIT":
-                        return '<span class="badge badge-deposit">DEPOSIT</span>'
-                    elif t_upper == "WITHDRAWAL":
-                        return '<span class="badge badge-withdrawal">WITHDRAWAL</span>'
-                    elif t_upper == "TRANSFER_IN":
-                        return '<span class="badge badge-transfer-in">TRANSFER IN</span>'
-                    elif t_upper == "TRANSFER_OUT":
-                        return '<span class="badge badge-transfer-out">TRANSFER OUT</span>'
-                    else:
-                        return f'<span class="badge">{t_upper}</span>'
-
-                # Type
-                type_col = 'type' if 'type' in df.columns else ('transaction_type' if 'transaction_type' in df.columns else None)
-                if type_col:
-                    df['Type'] = df[type_col].apply(type_badge)
-
-                # Amount
-                amt_col = 'amount' if 'amount' in df.columns else None
-                if amt_col:
-                    df['Amount'] = df[amt_col].apply(lambda x: f"₹{float(x):.2f}")
-
-                # Timestamp
-                ts_col = 'timestamp' if 'timestamp' in df.columns else None
-                if ts_col:
-                    def fmt_ts(x):
-                        s = str(x)
-                        # Keep date + time up to seconds
-                        return s[:19]
-                    df['Date/Time'] = df[ts_col].apply(fmt_ts)
-
-                # Description
-                desc_col = 'description' if 'description' in df.columns else None
-                if desc_col:
-                    df['Description'] = df[desc_col].fillna("")
-
-                # Order columns
-                display_cols = [c for c in ['Type', 'Amount', 'Description', 'Date/Time'] if c in df.columns]
-                html = df[display_cols].to_html(escape=False, index=False)
-                st.write(html, unsafe_allow_html=True)
-            else:
-                st.info("No transactions yet")
+            history_fragment()
 
         st.markdown("---")
 
         # Security info (collapsible)
         with st.expander("Security information"):
             st.markdown("""
-            - **Encryption in Use:** DES for transaction data, RSA 2048-bit for key exchange, SHA-256 for password hashing
+            - **Encryption in Use:** AES-GCM for transaction data, RSA 2048-bit for key exchange, salted scrypt for password hashing
             - **Security Features:** All transactions encrypted, secure key exchange protocol, transaction integrity verification, secure session management
             """)
 
@@ -384,6 +258,9 @@ def dashboard():
             st.session_state.logged_in = False
             st.session_state.account_number = None
             st.session_state.username = None
+            st.session_state.tx_page = 0
+            # Next login starts with a fresh session key
+            del st.session_state.banking_system
             st.rerun()
 
 # ==================== MAIN APP ====================
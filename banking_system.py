@@ -1,40 +1,143 @@
-from Crypto.Cipher import DES, PKCS1_OAEP
+from Crypto.Cipher import AES, PKCS1_OAEP
 from Crypto.PublicKey import RSA
 from Crypto.Random import get_random_bytes
-import base64
+import hashlib
+import hmac
 import json
-from typing import Tuple, Dict
+from binascii import a2b_base64, b2a_base64
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Tuple, Dict, List, Mapping, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Bound once for the per-transaction signature path
+_SHA256 = hashlib.sha256
+
+if orjson is not None:
+    def _canonical_bytes(data: Mapping) -> bytes:
+        """Serialize a dict to canonical (sorted-key, compact) JSON bytes"""
+        return orjson.dumps(data if isinstance(data, dict) else dict(data), option=orjson.OPT_SORT_KEYS)
+else:
+    def _check_portable(value):
+        """Reject values orjson would format differently (or refuse), so both paths sign the same bytes"""
+        if isinstance(value, float):
+            # Exponent forms differ (1e+16 vs 1e16, 1e-05 vs 0.00001); NaN/inf are refused by allow_nan
+            if 'e' in repr(value):
+                raise TypeError(f"Float {value!r} has no portable canonical form")
+        elif isinstance(value, int) and not isinstance(value, bool):
+            if not -2**63 <= value < 2**64:
+                raise TypeError("Integer exceeds 64-bit range")
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                if not isinstance(key, str):
+                    raise TypeError("Dict key must be str")
+                _check_portable(item)
+        elif isinstance(value, (list, tuple)):
+            for item in value:
+                _check_portable(item)
+    
+    def _canonical_bytes(data: Mapping) -> bytes:
+        """Serialize a dict to canonical (sorted-key, compact) JSON bytes"""
+        data = dict(data)
+        _check_portable(data)
+        return json.dumps(data, sort_keys=True, separators=(',', ':'), ensure_ascii=False, allow_nan=False).encode()
+
+@dataclass(frozen=True)
+class Transaction:
+    """Transaction dict with its canonical bytes and SHA-256 digest, computed once"""
+    # Private copy so the data can't drift from canonical/digest after creation;
+    # equality and hashing go by the canonical bytes, which stay hashable and picklable
+    _data: Dict = field(compare=False)
+    canonical: bytes
+    digest: bytes
+    
+    @classmethod
+    def from_dict(cls, data: Mapping) -> 'Transaction':
+        """Serialize and hash a snapshot of a transaction dict"""
+        data = dict(data)
+        canonical = _canonical_bytes(data)
+        return cls(data, canonical, _SHA256(canonical).digest())
+    
+    @property
+    def data(self) -> Mapping:
+        """Read-only view of the transaction dict"""
+        return MappingProxyType(self._data)
+
+def _canonical_of(transaction: Union[Transaction, Dict]) -> bytes:
+    """Canonical bytes of a Transaction or plain dict"""
+    if isinstance(transaction, Transaction):
+        return transaction.canonical
+    return _canonical_bytes(transaction)
+
+def _digest_of(transaction: Union[Transaction, Dict, bytes]) -> bytes:
+    """SHA-256 digest of a Transaction, plain dict or canonical bytes"""
+    if isinstance(transaction, Transaction):
+        return transaction.digest
+    if not isinstance(transaction, bytes):
+        transaction = _canonical_bytes(transaction)
+    return _SHA256(transaction).digest()
+
+def _digest_matches(transaction: Union[Transaction, Dict, bytes], signature: str) -> bool:
+    """Check one transaction against its hex signature"""
+    try:
+        expected = bytes.fromhex(signature)
+    except ValueError:
+        return False
+    return hmac.compare_digest(_digest_of(transaction), expected)
+
+# AES-GCM payload layout: nonce || tag || ciphertext
+GCM_NONCE_SIZE = 16
+GCM_TAG_SIZE = 16
+
+@lru_cache(maxsize=256)
+def _oaep_from_pub(public_key_str: str):
+    """Parse a PEM public key once and reuse its OAEP cipher"""
+    return PKCS1_OAEP.new(RSA.import_key(public_key_str.encode()))
+
+@lru_cache(maxsize=32)
+def _oaep_from_priv(private_key_str: str):
+    """Parse a PEM private key once and reuse its OAEP cipher"""
+    return PKCS1_OAEP.new(RSA.import_key(private_key_str.encode()))
 
 class EncryptionManager:
-    """Handles DES and RSA encryption/decryption"""
+    """Handles AES-GCM and RSA encryption/decryption"""
+    
+    # Caching parsed private keys keeps key material resident in process memory,
+    # so it is opt-in; public keys are always cached
+    cache_private_keys = False
     
     @staticmethod
-    def generate_des_key() -> bytes:
-        """Generate a 8-byte DES key"""
-        return get_random_bytes(8)
+    def generate_aes_key() -> bytes:
+        """Generate a 16-byte AES-128 key"""
+        return get_random_bytes(16)
     
     @staticmethod
-    def encrypt_des(data: str, key: bytes) -> str:
-        """Encrypt data using DES"""
-        try:
-            cipher = DES.new(key, DES.MODE_ECB)
-            # Pad data to 8-byte blocks
-            padded_data = data.ljust(len(data) + (8 - len(data) % 8)) if len(data) % 8 != 0 else data
-            encrypted = cipher.encrypt(padded_data.encode())
-            return base64.b64encode(encrypted).decode()
-        except Exception as e:
-            return f"Encryption error: {str(e)}"
+    def encrypt_aes(data: Union[str, bytes], key: bytes) -> str:
+        """Encrypt and authenticate data using AES-GCM"""
+        if isinstance(data, str):
+            data = data.encode()
+        # GCM is a stream mode, so no block padding is needed (or stripped on decrypt)
+        cipher = AES.new(key, AES.MODE_GCM)
+        ciphertext, tag = cipher.encrypt_and_digest(data)
+        return b2a_base64(b"".join((cipher.nonce, tag, ciphertext)), newline=False).decode()
     
     @staticmethod
-    def decrypt_des(encrypted_data: str, key: bytes) -> str:
-        """Decrypt DES encrypted data"""
-        try:
-            cipher = DES.new(key, DES.MODE_ECB)
-            encrypted = base64.b64decode(encrypted_data.encode())
-            decrypted = cipher.decrypt(encrypted).decode().strip()
-            return decrypted
-        except Exception as e:
-            return f"Decryption error: {str(e)}"
+    def decrypt_aes(encrypted_data: str, key: bytes) -> bytes:
+        """Decrypt and verify AES-GCM encrypted data; raises ValueError if tampered"""
+        # Slice through a memoryview so nonce, tag and ciphertext aren't copied
+        raw = memoryview(a2b_base64(encrypted_data))
+        nonce = raw[:GCM_NONCE_SIZE]
+        tag = raw[GCM_NONCE_SIZE:GCM_NONCE_SIZE + GCM_TAG_SIZE]
+        ciphertext = raw[GCM_NONCE_SIZE + GCM_TAG_SIZE:]
+        cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
+        return cipher.decrypt_and_verify(ciphertext, tag)
     
     @staticmethod
     def generate_rsa_keys(key_size: int = 2048) -> Tuple[str, str]:
@@ -47,24 +150,17 @@ class EncryptionManager:
     @staticmethod
     def encrypt_rsa(data: str, public_key_str: str) -> str:
         """Encrypt data using RSA public key"""
-        try:
-            public_key = RSA.import_key(public_key_str.encode())
-            cipher = PKCS1_OAEP.new(public_key)
-            encrypted = cipher.encrypt(data.encode())
-            return base64.b64encode(encrypted).decode()
-        except Exception as e:
-            return f"RSA encryption error: {str(e)}"
+        encrypted = _oaep_from_pub(public_key_str).encrypt(data.encode())
+        return b2a_base64(encrypted, newline=False).decode()
     
-    @staticmethod
-    def decrypt_rsa(encrypted_data: str, private_key_str: str) -> str:
+    @classmethod
+    def decrypt_rsa(cls, encrypted_data: str, private_key_str: str) -> str:
         """Decrypt RSA encrypted data using private key"""
-        try:
-            private_key = RSA.import_key(private_key_str.encode())
-            cipher = PKCS1_OAEP.new(private_key)
-            decrypted = cipher.decrypt(base64.b64decode(encrypted_data.encode()))
-            return decrypted.decode()
-        except Exception as e:
-            return f"RSA decryption error: {str(e)}"
+        if cls.cache_private_keys:
+            cipher = _oaep_from_priv(private_key_str)
+        else:
+            cipher = PKCS1_OAEP.new(RSA.import_key(private_key_str.encode()))
+        return cipher.decrypt(a2b_base64(encrypted_data)).decode()
 
 
 class BankingSystem:
@@ -72,103 +168,118 @@ class BankingSystem:
     
     def __init__(self):
         self.encryption_manager = EncryptionManager()
-        self.des_key = None
+        self.session_key = None
         self.session_data = {}
+        # RSA-wrapped session key per recipient public key
+        self._wrapped_key_cache: Dict[str, str] = {}
     
-    def set_session_des_key(self, key: bytes):
-        """Set DES key for current session"""
-        self.des_key = key
+    def set_session_key(self, key: bytes):
+        """Set AES key for current session"""
+        self.session_key = key
+        self._wrapped_key_cache.clear()
     
-    def get_session_des_key(self) -> bytes:
-        """Get current session DES key"""
-        if self.des_key is None:
-            self.des_key = self.encryption_manager.generate_des_key()
-        return self.des_key
+    def get_session_key(self) -> bytes:
+        """Get current session AES key"""
+        if self.session_key is None:
+            self.session_key = self.encryption_manager.generate_aes_key()
+        return self.session_key
     
-    def encrypt_transaction_data(self, transaction_data: Dict) -> Tuple[str, str]:
+    def encrypt_transaction_data(self, transaction_data: Union[Transaction, Dict]) -> Tuple[str, str]:
         """
-        Encrypt transaction data using DES
+        Encrypt transaction data using AES-GCM
         Returns encrypted_data and the base64 encoded key
         """
-        try:
-            key = self.get_session_des_key()
-            json_data = json.dumps(transaction_data)
-            encrypted = self.encryption_manager.encrypt_des(json_data, key)
-            key_b64 = base64.b64encode(key).decode()
-            return encrypted, key_b64
-        except Exception as e:
-            return f"Error: {str(e)}", ""
+        key = self.get_session_key()
+        # Canonical bytes go to the cipher as-is; a Transaction is not re-serialized
+        encrypted = self.encryption_manager.encrypt_aes(_canonical_of(transaction_data), key)
+        key_b64 = b2a_base64(key, newline=False).decode()
+        return encrypted, key_b64
     
     def decrypt_transaction_data(self, encrypted_data: str, key_b64: str) -> Dict:
-        """Decrypt transaction data using DES"""
+        """Decrypt transaction data using AES-GCM"""
         try:
-            key = base64.b64decode(key_b64.encode())
-            decrypted = self.encryption_manager.decrypt_des(encrypted_data, key)
-            return json.loads(decrypted)
+            key = a2b_base64(key_b64)
+            # json.loads parses the decrypted bytes directly, no decode step
+            return json.loads(self.encryption_manager.decrypt_aes(encrypted_data, key))
         except Exception as e:
             return {"error": str(e)}
     
-    def create_secure_transaction_record(self, transaction_data: Dict, public_key: str) -> Dict:
+    def create_secure_transaction_record(self, transaction_data: Union[Transaction, Dict], public_key: str) -> Dict:
         """
-        Create a transaction record encrypted with both DES and RSA
-        - Transaction details encrypted with DES
-        - DES key encrypted with RSA public key
+        Create a transaction record encrypted with both AES and RSA
+        - Transaction details encrypted with AES-GCM
+        - AES key encrypted with RSA public key
+        Integrity is covered by the GCM tag, so no separate signature is stored
         """
-        des_encrypted, des_key_b64 = self.encrypt_transaction_data(transaction_data)
+        try:
+            aes_encrypted, aes_key_b64 = self.encrypt_transaction_data(transaction_data)
+            
+            # Encrypt the AES key with RSA public key, once per session key and recipient
+            rsa_encrypted_key = self._wrapped_key_cache.get(public_key)
+            if rsa_encrypted_key is None:
+                rsa_encrypted_key = self.encryption_manager.encrypt_rsa(aes_key_b64, public_key)
+                self._wrapped_key_cache[public_key] = rsa_encrypted_key
+        except Exception as e:
+            return {"error": str(e)}
         
-        # Encrypt the DES key with RSA public key
-        rsa_encrypted_key = self.encryption_manager.encrypt_rsa(des_key_b64, public_key)
+        if isinstance(transaction_data, Transaction):
+            transaction_data = transaction_data.data
         
         return {
-            'encrypted_transaction': des_encrypted,
-            'encrypted_des_key': rsa_encrypted_key,
+            'encrypted_transaction': aes_encrypted,
+            'encrypted_key': rsa_encrypted_key,
             'timestamp': transaction_data.get('timestamp')
         }
     
     def retrieve_secure_transaction(self, secure_record: Dict, private_key: str) -> Dict:
-        """Retrieve and decrypt a secure transaction record"""
+        """Retrieve and decrypt a secure transaction record, verifying its GCM tag"""
         try:
-            # Decrypt DES key using RSA private key
-            des_key_b64 = self.encryption_manager.decrypt_rsa(
-                secure_record['encrypted_des_key'],
+            # Decrypt AES key using RSA private key
+            aes_key_b64 = self.encryption_manager.decrypt_rsa(
+                secure_record['encrypted_key'],
                 private_key
             )
             
-            # Decrypt transaction data using DES
+            # Decrypt transaction data using AES-GCM
             transaction_data = self.decrypt_transaction_data(
                 secure_record['encrypted_transaction'],
-                des_key_b64
+                aes_key_b64
             )
             
             return transaction_data
         except Exception as e:
             return {"error": str(e)}
     
-    def generate_transaction_summary(self, account_number: str, amount: float, tx_type: str) -> Dict:
-        """Generate a transaction summary for encryption"""
-        return {
+    def generate_transaction_summary(self, account_number: str, amount: float, tx_type: str) -> Transaction:
+        """Generate a transaction summary for signing and encryption"""
+        return Transaction.from_dict({
             'account_number': account_number,
             'amount': amount,
             'transaction_type': tx_type,
-            'timestamp': str(__import__('datetime').datetime.now()),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
             'status': 'PENDING'
-        }
+        })
     
     @staticmethod
-    def verify_transaction_integrity(transaction: Dict, signature: str) -> bool:
-        """Verify transaction hasn't been tampered with"""
-        # For demo: simple checksum verification
-        try:
-            import hashlib
-            data_str = json.dumps(transaction, sort_keys=True)
-            computed_hash = hashlib.sha256(data_str.encode()).hexdigest()
-            return computed_hash == signature
-        except:
-            return False
+    def verify_transaction_integrity(transaction: Union[Transaction, Dict], signature: str) -> bool:
+        """Verify an unencrypted audit record hasn't been tampered with"""
+        return _digest_matches(transaction, signature)
     
     @staticmethod
-    def create_transaction_signature(transaction: Dict) -> str:
-        """Create transaction signature for integrity verification"""
-        import hashlib
-        data_str = json.dumps(transaction, sort_keys=True)
-        return hashlib.sha256(data_str.encode()).hexdigest()
+    def create_transaction_signature(transaction: Union[Transaction, Dict]) -> str:
+        """Create signature for an unencrypted audit record (encrypted records use the GCM tag)"""
+        return _digest_of(transaction).hex()
+    
+    @staticmethod
+    def verify_batch(transactions: List[Union[Transaction, Dict, bytes]], signatures: List[str], workers: Optional[int] = None) -> List[bool]:
+        """
+        Verify many audit records against their signatures
+        Transactions and canonical bytes skip re-serialization; hashlib releases the GIL
+        on large buffers, so workers > 1 hashes them in parallel threads
+        """
+        if len(transactions) != len(signatures):
+            raise ValueError(f"{len(transactions)} transactions but {len(signatures)} signatures")
+        if workers and workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                return list(pool.map(_digest_matches, transactions, signatures))
+        return list(map(_digest_matches, transactions, signatures))
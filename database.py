@@ -1,168 +1,412 @@
 import sqlite3
 import hashlib
+import hmac
+import os
+import queue
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from decimal import Decimal, ROUND_HALF_UP
 from typing import Tuple, Optional, List, Dict
 
+# Schema version stored in PRAGMA user_version:
+# 1 = money values scaled to paise, 2 = users.balance / transactions.amount rebuilt as INTEGER columns
+_SCHEMA_VERSION = 2
+
+# Applied to every connection; journal_mode=WAL is persistent and set in init_database
+_CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA foreign_keys=ON",
+)
+
+# Hashed against on unknown usernames so a miss costs the same scrypt as a wrong password
+_DUMMY_SALT = '00' * 16
+_DUMMY_HASH = '00' * 64
+
+# Table definitions; {table} lets the migration build a replacement table before swapping it in
+_USERS_DDL = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        account_number TEXT PRIMARY KEY,
+        username TEXT UNIQUE NOT NULL,
+        password_hash TEXT NOT NULL,
+        password_salt TEXT,
+        full_name TEXT NOT NULL,
+        balance INTEGER NOT NULL DEFAULT 0,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+'''
+_TRANSACTIONS_DDL = '''
+    CREATE TABLE IF NOT EXISTS {table} (
+        transaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        account_number TEXT NOT NULL,
+        transaction_type TEXT NOT NULL,
+        amount INTEGER NOT NULL,
+        description TEXT,
+        timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (account_number) REFERENCES users(account_number)
+    )
+'''
+
+# Hot-path SQL kept as constants so identical text always hits the statement cache
+# Account numbers come from an AUTOINCREMENT sequence: O(1), never reused after a delete
+_SQL_NEXT_ACCOUNT_NUMBER = 'INSERT INTO account_numbers DEFAULT VALUES RETURNING id'
+_SQL_INSERT_USER = '''
+    INSERT INTO users (account_number, username, password_hash, password_salt, full_name, balance)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+_SQL_SELECT_LOGIN = '''
+    SELECT account_number, password_hash, password_salt FROM users 
+    WHERE username = ?
+'''
+_SQL_UPDATE_PASSWORD = '''
+    UPDATE users SET password_hash = ?, password_salt = ?
+    WHERE account_number = ?
+'''
+_SQL_SELECT_ACCOUNT = '''
+    SELECT username, full_name, balance, created_at FROM users 
+    WHERE account_number = ?
+'''
+_SQL_SELECT_BALANCE = 'SELECT balance FROM users WHERE account_number = ?'
+# Every balance change goes through these two updates; the debit only matches if funds cover it.
+# executemany can't report rowcount for RETURNING statements, so batches use the bare UPDATE.
+_SQL_DEBIT_MANY = '''
+    UPDATE users SET balance = balance - :amount
+    WHERE account_number = :account AND balance >= :amount
+'''
+_SQL_CREDIT_MANY = '''
+    UPDATE users SET balance = balance + :amount
+    WHERE account_number = :account
+'''
+_SQL_DEBIT = _SQL_DEBIT_MANY + 'RETURNING balance'
+_SQL_CREDIT = _SQL_CREDIT_MANY + 'RETURNING balance'
+_SQL_INSERT_TRANSACTION = '''
+    INSERT INTO transactions (account_number, transaction_type, amount, description)
+    VALUES (?, ?, ?, ?)
+'''
+_SQL_SELECT_HISTORY = '''
+    SELECT transaction_id, UPPER(transaction_type), amount,
+           COALESCE(description, ''), substr(timestamp, 1, 19)
+    FROM transactions
+    WHERE account_number = ?
+    ORDER BY timestamp DESC, transaction_id DESC
+    LIMIT ? OFFSET ?
+'''
+
+def _to_paise(amount: float) -> int:
+    """Convert a rupee amount to integer paise"""
+    return int((Decimal(str(amount)) * 100).to_integral_value(ROUND_HALF_UP))
+
+def _to_rupees(paise: int) -> float:
+    """Convert integer paise to a rupee amount"""
+    return int(paise) / 100
+
+class _RollbackWrite(Exception):
+    """Raised inside a _write() block to undo it; the message is reported to the caller"""
+
 class BankingDatabase:
     """Handles all database operations for the banking system"""
     
-    def __init__(self, db_name: str = "banking_system.db"):
+    def __init__(self, db_name: str = "banking_system.db", readers: Optional[int] = None):
         self.db_name = db_name
+        # Long-lived connections so their prepared statement caches stay warm:
+        # a single writer plus a pool of readers that WAL lets run concurrently
+        self._writer = self.get_connection()
+        self._write_lock = threading.Lock()
         self.init_database()
+        
+        self._readers = queue.Queue()
+        for _ in range(readers or os.cpu_count() or 1):
+            self._readers.put(self.get_connection())
     
     def get_connection(self):
         """Get database connection"""
-        conn = sqlite3.connect(self.db_name)
+        conn = sqlite3.connect(self.db_name, check_same_thread=False, cached_statements=256, isolation_level=None)
         conn.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
         return conn
     
+    def close(self):
+        """Close all database connections"""
+        with self._write_lock:
+            self._writer.close()
+        while not self._readers.empty():
+            self._readers.get_nowait().close()
+    
+    @contextmanager
+    def _write(self):
+        """Run a write transaction on the writer connection"""
+        with self._write_lock:
+            cursor = self._writer.cursor()
+            # Take the write lock up front instead of upgrading mid-transaction
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+            except BaseException:
+                self._writer.rollback()
+                raise
+            else:
+                self._writer.commit()
+    
+    @contextmanager
+    def _read(self):
+        """Check out a reader connection from the pool"""
+        conn = self._readers.get()
+        try:
+            yield conn.cursor()
+        finally:
+            self._readers.put(conn)
+    
     def init_database(self):
         """Initialize database with required tables"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        # The migration below drops and renames tables; foreign keys can only be
+        # toggled outside a transaction, so they are off for the whole init
+        self._writer.execute("PRAGMA foreign_keys=OFF")
         
-        # Users table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS users (
-                account_number TEXT PRIMARY KEY,
-                username TEXT UNIQUE NOT NULL,
-                password_hash TEXT NOT NULL,
-                full_name TEXT NOT NULL,
-                balance REAL DEFAULT 0.0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
+        with self._write() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users'")
+            is_new = cursor.fetchone() is None
+            
+            # Users table
+            cursor.execute(_USERS_DDL.format(table='users'))
+            
+            # Account number sequence, seeded past any existing (including legacy) numbers;
+            # an explicit id below the current sequence is ignored and doesn't rewind it
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS account_numbers (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT
+                )
+            ''')
+            cursor.execute('''
+                INSERT OR IGNORE INTO account_numbers (id)
+                SELECT COALESCE(MAX(CAST(account_number AS INTEGER)), 1000) FROM users
+            ''')
+            
+            # Transactions table
+            cursor.execute(_TRANSACTIONS_DDL.format(table='transactions'))
+            
+            # Keys table for RSA key storage
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS rsa_keys (
+                    account_number TEXT PRIMARY KEY,
+                    public_key TEXT NOT NULL,
+                    private_key TEXT NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (account_number) REFERENCES users(account_number)
+                )
+            ''')
+            
+            # Older databases predate per-user password salts
+            cursor.execute("PRAGMA table_info(users)")
+            if 'password_salt' not in [row[1] for row in cursor.fetchall()]:
+                cursor.execute("ALTER TABLE users ADD COLUMN password_salt TEXT")
+            
+            # Older databases stored rupees in REAL columns; rebuild them as integer paise once
+            cursor.execute("PRAGMA user_version")
+            version = cursor.fetchone()[0]
+            if version < _SCHEMA_VERSION:
+                if not is_new:
+                    self._rebuild_money_columns(cursor, scale=100 if version < 1 else 1)
+                cursor.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            
+            # Covering index for transaction history: walked in order, no table lookups
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_tx_acct_time
+                ON transactions (account_number, timestamp DESC, transaction_id DESC,
+                                 transaction_type, amount, description)
+            ''')
         
-        # Transactions table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS transactions (
-                transaction_id INTEGER PRIMARY KEY AUTOINCREMENT,
-                account_number TEXT NOT NULL,
-                transaction_type TEXT NOT NULL,
-                amount REAL NOT NULL,
-                description TEXT,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (account_number) REFERENCES users(account_number)
-            )
+        self._writer.execute("PRAGMA foreign_keys=ON")
+    
+    @staticmethod
+    def _rebuild_money_columns(cursor, scale: int):
+        """Recreate users and transactions with INTEGER money columns, scaling old values to paise"""
+        # Only changing the values would leave the legacy REAL column affinity in place
+        cursor.execute(_USERS_DDL.format(table='users_new'))
+        cursor.execute(f'''
+            INSERT INTO users_new (account_number, username, password_hash, password_salt, full_name, balance, created_at)
+            SELECT account_number, username, password_hash, password_salt, full_name,
+                   CAST(ROUND(COALESCE(balance, 0) * {scale}) AS INTEGER), created_at
+            FROM users
         ''')
+        cursor.execute("DROP TABLE users")
+        cursor.execute("ALTER TABLE users_new RENAME TO users")
         
-        # Keys table for RSA key storage
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS rsa_keys (
-                account_number TEXT PRIMARY KEY,
-                public_key TEXT NOT NULL,
-                private_key TEXT NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (account_number) REFERENCES users(account_number)
-            )
+        # Keep the AUTOINCREMENT high-water mark so transaction ids are never reused
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = 'transactions'")
+        row = cursor.fetchone()
+        cursor.execute(_TRANSACTIONS_DDL.format(table='transactions_new'))
+        cursor.execute(f'''
+            INSERT INTO transactions_new (transaction_id, account_number, transaction_type, amount, description, timestamp)
+            SELECT transaction_id, account_number, transaction_type,
+                   CAST(ROUND(amount * {scale}) AS INTEGER), description, timestamp
+            FROM transactions
         ''')
-        
-        conn.commit()
-        conn.close()
+        cursor.execute("DROP TABLE transactions")
+        cursor.execute("ALTER TABLE transactions_new RENAME TO transactions")
+        if row:
+            cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = 'transactions'", (row[0],))
+    
+    @staticmethod
+    def hash_password(password: str, salt: str) -> str:
+        """Hash password using scrypt with a per-user salt"""
+        return hashlib.scrypt(password.encode(), salt=bytes.fromhex(salt), n=16384, r=8, p=1).hex()
     
     @staticmethod
-    def hash_password(password: str) -> str:
-        """Hash password using SHA-256"""
+    def generate_salt() -> str:
+        """Generate a random 16-byte password salt"""
+        return os.urandom(16).hex()
+    
+    @staticmethod
+    def _legacy_hash_password(password: str) -> str:
+        """Unsalted SHA-256 hash used by accounts created before scrypt"""
         return hashlib.sha256(password.encode()).hexdigest()
     
     def create_account(self, username: str, password: str, full_name: str, initial_balance: float = 1000.0) -> Tuple[bool, str, str]:
         """Create new bank account"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+            password_salt = self.generate_salt()
+            password_hash = self.hash_password(password, password_salt)
             
-            # Generate account number (simple format)
-            cursor.execute("SELECT MAX(account_number) FROM users")
-            result = cursor.fetchone()
-            account_num = int(result[0] or 0) + 1001
-            account_number = str(account_num)
-            
-            password_hash = self.hash_password(password)
-            
-            cursor.execute('''
-                INSERT INTO users (account_number, username, password_hash, full_name, balance)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (account_number, username, password_hash, full_name, initial_balance))
-            
-            conn.commit()
-            conn.close()
+            with self._write() as cursor:
+                account_number = str(cursor.execute(_SQL_NEXT_ACCOUNT_NUMBER).fetchone()[0])
+                cursor.execute(_SQL_INSERT_USER, (account_number, username, password_hash, password_salt, full_name, _to_paise(initial_balance)))
             
             return True, account_number, "Account created successfully"
-        except sqlite3.IntegrityError:
-            return False, "", "Username already exists"
+        except sqlite3.IntegrityError as e:
+            if 'users.username' in str(e):
+                return False, "", "Username already exists"
+            if 'users.account_number' in str(e):
+                return False, "", "Account number already in use, please try again"
+            return False, "", str(e)
         except Exception as e:
             return False, "", str(e)
     
     def verify_login(self, username: str, password: str) -> Tuple[bool, str]:
         """Verify user credentials"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
+            with self._read() as cursor:
+                result = cursor.execute(_SQL_SELECT_LOGIN, (username,)).fetchone()
             
-            password_hash = self.hash_password(password)
-            
-            cursor.execute('''
-                SELECT account_number FROM users 
-                WHERE username = ? AND password_hash = ?
-            ''', (username, password_hash))
-            
-            result = cursor.fetchone()
-            conn.close()
-            
-            if result:
-                return True, result[0]
+            if not result:
+                hmac.compare_digest(self.hash_password(password, _DUMMY_SALT), _DUMMY_HASH)
+                return False, ""
+            
+            account_number, stored_hash, salt = result
+            
+            if salt:
+                valid = hmac.compare_digest(self.hash_password(password, salt), stored_hash)
+            else:
+                # Upgrade legacy SHA-256 hashes to scrypt on successful login
+                valid = hmac.compare_digest(self._legacy_hash_password(password), stored_hash)
+                if valid:
+                    salt = self.generate_salt()
+                    password_hash = self.hash_password(password, salt)
+                    with self._write() as cursor:
+                        cursor.execute(_SQL_UPDATE_PASSWORD, (password_hash, salt, account_number))
+            
+            if valid:
+                return True, account_number
             return False, ""
         except Exception as e:
             return False, str(e)
     
+    @staticmethod
+    def _fetch_account_info(cursor, account_number: str) -> Optional[Dict]:
+        """Read account information using an open cursor"""
+        cursor.execute(_SQL_SELECT_ACCOUNT, (account_number,))
+        
+        result = cursor.fetchone()
+        
+        if result:
+            return {
+                'username': result[0],
+                'full_name': result[1],
+                'balance': _to_rupees(result[2]),
+                'created_at': result[3]
+            }
+        return None
+    
+    @staticmethod
+    def _fetch_transaction_history(cursor, account_number: str, limit: int, offset: int = 0) -> List[Dict]:
+        """Read recent transactions using an open cursor"""
+        cursor.execute(_SQL_SELECT_HISTORY, (account_number, limit, offset))
+        
+        transactions = []
+        for row in cursor.fetchall():
+            transactions.append({
+                'id': row[0],
+                'type': row[1],
+                'amount': _to_rupees(row[2]),
+                'description': row[3],
+                'timestamp': row[4]
+            })
+        
+        return transactions
+    
     def get_account_info(self, account_number: str) -> Optional[Dict]:
         """Get user account information"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT username, full_name, balance, created_at FROM users 
-                WHERE account_number = ?
-            ''', (account_number,))
-            
-            result = cursor.fetchone()
-            conn.close()
-            
-            if result:
-                return {
-                    'username': result[0],
-                    'full_name': result[1],
-                    'balance': result[2],
-                    'created_at': result[3]
-                }
+            with self._read() as cursor:
+                return self._fetch_account_info(cursor, account_number)
+        except Exception as e:
             return None
+    
+    def get_dashboard_snapshot(self, account_number: str, tx_limit: int = 50) -> Tuple[Optional[Dict], List[Dict]]:
+        """Get account information and recent transactions in one connection"""
+        try:
+            with self._read() as cursor:
+                # Both reads see the same WAL snapshot
+                cursor.execute("BEGIN")
+                try:
+                    info = self._fetch_account_info(cursor, account_number)
+                    transactions = self._fetch_transaction_history(cursor, account_number, tx_limit) if info else []
+                finally:
+                    cursor.execute("COMMIT")
+            
+            return info, transactions
         except Exception as e:
+            return None, []
+    
+    @staticmethod
+    def _post(cursor, account_number: str, amount_paise: int, tx_type: str, description: str) -> Optional[int]:
+        """
+        Apply one deposit or withdrawal inside an open write transaction
+        Returns the new balance in paise, or None if the account is missing or can't cover a withdrawal
+        """
+        sql = _SQL_DEBIT if tx_type == 'WITHDRAWAL' else _SQL_CREDIT
+        result = cursor.execute(sql, {'amount': amount_paise, 'account': account_number}).fetchone()
+        if not result:
             return None
+        cursor.execute(_SQL_INSERT_TRANSACTION, (account_number, tx_type, amount_paise, description))
+        return result[0]
+    
+    @staticmethod
+    def _post_failure(cursor, account_number: str) -> Tuple[str, float]:
+        """Tell a missing account from insufficient balance after _post returned None"""
+        cursor.execute(_SQL_SELECT_BALANCE, (account_number,))
+        current = cursor.fetchone()
+        if not current:
+            return "Account not found", 0.0
+        return "Insufficient balance", _to_rupees(current[0])
     
     def deposit(self, account_number: str, amount: float, description: str = "Deposit") -> Tuple[bool, str, float]:
         """Deposit money to account"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('SELECT balance FROM users WHERE account_number = ?', (account_number,))
-            result = cursor.fetchone()
+            amount_paise = _to_paise(amount)
+            if amount_paise <= 0:
+                return False, "Amount must be positive", 0.0
             
-            if not result:
-                return False, "Account not found", 0.0
-            
-            new_balance = result[0] + amount
-            
-            cursor.execute('UPDATE users SET balance = ? WHERE account_number = ?', (new_balance, account_number))
-            cursor.execute('''
-                INSERT INTO transactions (account_number, transaction_type, amount, description)
-                VALUES (?, ?, ?, ?)
-            ''', (account_number, 'DEPOSIT', amount, description))
-            
-            conn.commit()
-            conn.close()
+            with self._write() as cursor:
+                new_balance_paise = self._post(cursor, account_number, amount_paise, 'DEPOSIT', description)
+                if new_balance_paise is None:
+                    return False, "Account not found", 0.0
             
+            new_balance = _to_rupees(new_balance_paise)
             return True, f"Deposit successful. New balance: {new_balance}", new_balance
         except Exception as e:
             return False, str(e), 0.0
@@ -170,106 +414,108 @@ class BankingDatabase:
     def withdraw(self, account_number: str, amount: float, description: str = "Withdrawal") -> Tuple[bool, str, float]:
         """Withdraw money from account"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('SELECT balance FROM users WHERE account_number = ?', (account_number,))
-            result = cursor.fetchone()
-            
-            if not result:
-                return False, "Account not found", 0.0
-            
-            current_balance = result[0]
-            
-            if amount > current_balance:
-                return False, "Insufficient balance", current_balance
-            
-            new_balance = current_balance - amount
-            
-            cursor.execute('UPDATE users SET balance = ? WHERE account_number = ?', (new_balance, account_number))
-            cursor.execute('''
-                INSERT INTO transactions (account_number, transaction_type, amount, description)
-                VALUES (?, ?, ?, ?)
-            ''', (account_number, 'WITHDRAWAL', amount, description))
-            
-            conn.commit()
-            conn.close()
-            
+            amount_paise = _to_paise(amount)
+            if amount_paise <= 0:
+                return False, "Amount must be positive", 0.0
+            
+            with self._write() as cursor:
+                new_balance_paise = self._post(cursor, account_number, amount_paise, 'WITHDRAWAL', description)
+                if new_balance_paise is None:
+                    # Only read back to tell the two failure cases apart
+                    message, balance = self._post_failure(cursor, account_number)
+                    return False, message, balance
+            
+            new_balance = _to_rupees(new_balance_paise)
             return True, f"Withdrawal successful. New balance: {new_balance}", new_balance
         except Exception as e:
             return False, str(e), 0.0
     
-    def transfer(self, from_account: str, to_account: str, amount: float) -> Tuple[bool, str]:
-        """Transfer money between accounts"""
+    def _post_many(self, entries: List[Tuple[str, float, str]], tx_type: str) -> Tuple[bool, str]:
+        """Apply many deposits or withdrawals in a single transaction; all or nothing"""
+        entries = [(account_number, _to_paise(amount), description) for account_number, amount, description in entries]
+        if any(amount <= 0 for _, amount, _ in entries):
+            return False, "Amount must be positive"
+        
+        sql = _SQL_DEBIT_MANY if tx_type == 'WITHDRAWAL' else _SQL_CREDIT_MANY
+        with self._write() as cursor:
+            cursor.execute("SAVEPOINT batch")
+            cursor.executemany(sql, [{'amount': amount, 'account': account_number} for account_number, amount, _ in entries])
+            
+            if cursor.rowcount != len(entries):
+                # Failures only: undo the batch and replay it row by row to name the bad entry
+                cursor.execute("ROLLBACK TO batch")
+                raise _RollbackWrite(self._batch_failure(cursor, entries, tx_type))
+            
+            cursor.executemany(_SQL_INSERT_TRANSACTION, [
+                (account_number, tx_type, amount, description)
+                for account_number, amount, description in entries
+            ])
+        
+        return True, f"{len(entries)} {tx_type.lower()}s successful"
+    
+    @classmethod
+    def _batch_failure(cls, cursor, entries: List[Tuple[str, int, str]], tx_type: str) -> str:
+        """Find the first batch entry that can't be applied and say why"""
+        for account_number, amount, description in entries:
+            if cls._post(cursor, account_number, amount, tx_type, description) is None:
+                message, _ = cls._post_failure(cursor, account_number)
+                return f"{message} ({account_number})"
+        return "Batch could not be applied"
+    
+    def deposit_many(self, entries: List[Tuple[str, float, str]]) -> Tuple[bool, str]:
+        """Deposit to many accounts in a single transaction; all or nothing"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            # Check if both accounts exist
-            cursor.execute('SELECT balance FROM users WHERE account_number = ?', (from_account,))
-            from_result = cursor.fetchone()
-            
-            cursor.execute('SELECT balance FROM users WHERE account_number = ?', (to_account,))
-            to_result = cursor.fetchone()
-            
-            if not from_result or not to_result:
-                return False, "One or both accounts not found"
-            
-            if amount > from_result[0]:
-                return False, "Insufficient balance"
-            
-            # Perform transfer
-            new_from_balance = from_result[0] - amount
-            new_to_balance = to_result[0] + amount
-            
-            cursor.execute('UPDATE users SET balance = ? WHERE account_number = ?', (new_from_balance, from_account))
-            cursor.execute('UPDATE users SET balance = ? WHERE account_number = ?', (new_to_balance, to_account))
-            
-            # Log transactions
-            cursor.execute('''
-                INSERT INTO transactions (account_number, transaction_type, amount, description)
-                VALUES (?, ?, ?, ?)
-            ''', (from_account, 'TRANSFER_OUT', amount, f"Transfer to {to_account}"))
-            
-            cursor.execute('''
-                INSERT INTO transactions (account_number, transaction_type, amount, description)
-                VALUES (?, ?, ?, ?)
-            ''', (to_account, 'TRANSFER_IN', amount, f"Transfer from {from_account}"))
-            
-            conn.commit()
-            conn.close()
-            
-            return True, f"Transfer successful"
+            return self._post_many(entries, 'DEPOSIT')
+        except Exception as e:
+            return False, str(e)
+    
+    def withdraw_many(self, entries: List[Tuple[str, float, str]]) -> Tuple[bool, str]:
+        """Withdraw from many accounts in a single transaction; all or nothing"""
+        try:
+            return self._post_many(entries, 'WITHDRAWAL')
         except Exception as e:
             return False, str(e)
     
-    def get_transaction_history(self, account_number: str, limit: int = 10) -> List[Dict]:
+    def transfer(self, from_account: str, to_account: str, amount: float) -> Tuple[bool, str, float]:
+        """Transfer money between accounts"""
+        try:
+            amount_paise = _to_paise(amount)
+            if amount_paise <= 0:
+                return False, "Amount must be positive", 0.0
+            if from_account == to_account:
+                return False, "Cannot transfer to the same account", 0.0
+            
+            with self._write() as cursor:
+                # Debit only succeeds if the sender exists and can cover the amount
+                result = cursor.execute(_SQL_DEBIT, {'amount': amount_paise, 'account': from_account}).fetchone()
+                
+                if not result:
+                    cursor.execute(_SQL_SELECT_BALANCE, (from_account,))
+                    from_result = cursor.fetchone()
+                    if not from_result:
+                        return False, "One or both accounts not found", 0.0
+                    return False, "Insufficient balance", _to_rupees(from_result[0])
+                
+                new_from_balance = _to_rupees(result[0])
+                
+                if cursor.execute(_SQL_CREDIT, {'amount': amount_paise, 'account': to_account}).fetchone() is None:
+                    # Recipient doesn't exist; undo the debit
+                    raise _RollbackWrite("One or both accounts not found")
+                
+                # Log transactions
+                cursor.executemany(_SQL_INSERT_TRANSACTION, [
+                    (from_account, 'TRANSFER_OUT', amount_paise, f"Transfer to {to_account}"),
+                    (to_account, 'TRANSFER_IN', amount_paise, f"Transfer from {from_account}")
+                ])
+            
+            return True, f"Transfer successful", new_from_balance
+        except Exception as e:
+            return False, str(e), 0.0
+    
+    def get_transaction_history(self, account_number: str, limit: int = 10, offset: int = 0) -> List[Dict]:
         """Get recent transactions"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT transaction_id, transaction_type, amount, description, timestamp
-                FROM transactions
-                WHERE account_number = ?
-                ORDER BY timestamp DESC
-                LIMIT ?
-            ''', (account_number, limit))
-            
-            results = cursor.fetchall()
-            conn.close()
-            
-            transactions = []
-            for row in results:
-                transactions.append({
-                    'id': row[0],
-                    'type': row[1],
-                    'amount': row[2],
-                    'description': row[3],
-                    'timestamp': row[4]
-                })
-            
-            return transactions
+            with self._read() as cursor:
+                return self._fetch_transaction_history(cursor, account_number, limit, offset)
         except Exception as e:
             return []
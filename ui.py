@@ -0,0 +1,76 @@
+import os
+from functools import lru_cache
+import streamlit as st
+
+# Display labels for transaction types (emoji prefix instead of HTML badges)
+TYPE_LABELS = {
+    "DEPOSIT": "🟢 DEPOSIT",
+    "WITHDRAWAL": "🔴 WITHDRAWAL",
+    "TRANSFER_IN": "🔵 TRANSFER IN",
+    "TRANSFER_OUT": "🟡 TRANSFER OUT",
+}
+
+# Transaction history fields and their display headers, in display order
+HISTORY_COLUMNS = {
+    'type': 'Type',
+    'amount': 'Amount',
+    'description': 'Description',
+    'timestamp': 'Date/Time',
+}
+
+
+@st.cache_data
+def load_css():
+    """Read the app stylesheet once per process"""
+    with open(os.path.join(os.path.dirname(__file__), "styles.css"), encoding="utf-8") as f:
+        return f.read()
+
+
+def inject_css():
+    """Inject the app stylesheet into the current page"""
+    st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
+
+
+@lru_cache(maxsize=256)
+def render_card(title: str, value: str) -> str:
+    """Build the HTML for a dashboard summary card"""
+    return f"<div class='card'><b>{title}</b>{value}</div>"
+
+
+def show_success(msg: str) -> None:
+    """Show a success message box"""
+    st.markdown(f'<div class="success-box">{msg}</div>', unsafe_allow_html=True)
+
+
+def show_error(msg: str) -> None:
+    """Show an error message box"""
+    st.markdown(f'<div class="error-box">{msg}</div>', unsafe_allow_html=True)
+
+
+def show_info(msg: str) -> None:
+    """Show an info message box"""
+    st.markdown(f'<div class="info-box">{msg}</div>', unsafe_allow_html=True)
+
+
+def format_transactions(df):
+    """Build the display columns for the transaction history table"""
+    # get_transaction_history returns display-ready type, amount, description and timestamp
+    df = df.rename(columns=HISTORY_COLUMNS)
+    df['Type'] = df['Type'].map(TYPE_LABELS).fillna(df['Type'])
+    return df[list(HISTORY_COLUMNS.values())]
+
+
+def render_transactions(transactions):
+    """Render the transaction history as a native Streamlit dataframe"""
+    # pandas is only needed once the history tab has rows to show
+    import pandas as pd
+
+    st.dataframe(
+        format_transactions(pd.DataFrame(transactions)),
+        column_config={
+            'Type': st.column_config.TextColumn(),
+            'Amount': st.column_config.NumberColumn(format="₹%.2f"),
+        },
+        hide_index=True,
+        use_container_width=True
+    )